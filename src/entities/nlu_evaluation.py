@@ -0,0 +1,50 @@
+"""
+Path: src/entities/nlu_evaluation.py
+"""
+
+class EjemploNlu:
+    "Mensaje a evaluar contra el modelo NLU, con intent esperado opcional"
+    def __init__(self, texto: str, intent_esperado: str = None, origen: str = None):
+        self.texto = texto
+        self.intent_esperado = intent_esperado
+        self.origen = origen
+
+    def esta_etiquetado(self) -> bool:
+        "Indica si el ejemplo tiene un intent esperado para medir exactitud"
+        return self.intent_esperado is not None
+
+
+class PrediccionNlu:
+    "Resultado de interpretar un EjemploNlu con el modelo NLU"
+    def __init__(self, ejemplo: EjemploNlu, ranking: list, segundos: float):
+        """
+        :param ejemplo: EjemploNlu interpretado.
+        :param ranking: list[(intent, confianza)] ordenada de mayor a menor, sin `nlu_fallback`.
+        :param segundos: float, tiempo de inferencia del mensaje.
+        """
+        self.ejemplo = ejemplo
+        self.ranking = ranking
+        self.segundos = segundos
+
+    @property
+    def intent(self):
+        "Intent con mayor confianza según el clasificador"
+        return self.ranking[0][0] if self.ranking else None
+
+    @property
+    def confianza(self) -> float:
+        "Confianza del intent principal"
+        return self.ranking[0][1] if self.ranking else 0.0
+
+    @property
+    def margen(self) -> float:
+        "Diferencia de confianza entre los dos primeros intents del ranking"
+        if len(self.ranking) < 2:
+            return self.confianza
+        return self.ranking[0][1] - self.ranking[1][1]
+
+    def es_fallback(self, threshold: float, ambiguity_threshold: float) -> bool:
+        "Replica la decisión del FallbackClassifier de Rasa para los umbrales dados"
+        if self.confianza < threshold:
+            return True
+        return len(self.ranking) >= 2 and self.margen < ambiguity_threshold
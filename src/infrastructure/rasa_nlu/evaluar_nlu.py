@@ -0,0 +1,229 @@
+"""
+Path: src/infrastructure/rasa_nlu/evaluar_nlu.py
+
+Evaluación offline del NLU: mide cuántos mensajes terminarían en una llamada a Gemini
+(por el FallbackClassifier o por intents que las reglas derivan a action_gemini_fallback)
+para distintos umbrales y variantes de pipeline.
+
+Uso:
+    python -m src.infrastructure.rasa_nlu.evaluar_nlu --datos set_de_prueba.yml --transcripciones archivo/
+    python -m src.infrastructure.rasa_nlu.evaluar_nlu --datos set_de_prueba.yml --variantes --epocas-diet 50,100,200
+
+`--datos` debe ser un set etiquetado distinto de los datos de entrenamiento: con los
+ejemplos de entrenamiento las confianzas están infladas y la recomendación de umbrales
+se sesga hacia valores más bajos.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+from datetime import datetime
+
+import yaml
+
+from src.shared.logger_rasa_v0 import get_logger
+from src.infrastructure.repositories.yaml_nlu_repository import YamlNluRepository
+from src.infrastructure.repositories.json_transcripts_repository import JsonTranscriptsRepository
+from src.infrastructure.repositories.yaml_dialogue_repository import YamlDialogueRepository
+from src.infrastructure.rasa_nlu.rasa_nlu_interpreter import RasaNluInterpreter
+from src.infrastructure.rasa_nlu.rasa_nlu_trainer import RasaNluTrainer
+from src.use_cases.evaluar_nlu import EvaluarNluUseCase
+from src.use_cases.variantes_pipeline_nlu import GenerarVariantesPipelineUseCase
+
+logger = get_logger("evaluar-nlu")
+
+THRESHOLDS = "0.1,0.15,0.2,0.25,0.3,0.35,0.4,0.5,0.6,0.7"
+AMBIGUITY_THRESHOLDS = "0.0,0.05,0.1"
+ACCION_GEMINI = "action_gemini_fallback"
+
+
+def _lista_floats(valor):
+    return [float(v) for v in valor.split(",") if v.strip()]
+
+
+def _lista_strs(valor):
+    return [v.strip() for v in valor.split(",") if v.strip()]
+
+
+def _lista_ints(valor):
+    return [int(v) for v in valor.split(",") if v.strip()]
+
+
+def _modelo_mas_reciente(models_dir="models"):
+    modelos = glob.glob(os.path.join(models_dir, "*.tar.gz"))
+    return max(modelos, key=os.path.getmtime) if modelos else None
+
+
+def parse_args(argv=None):
+    "Argumentos de línea de comandos del harness de evaluación"
+    parser = argparse.ArgumentParser(description="Evaluación offline del NLU y de la tasa de fallback a Gemini")
+    parser.add_argument("--modelo", help="Modelo .tar.gz a evaluar (por defecto el más reciente en models/)")
+    parser.add_argument("--config", default="config.yml", help="config.yml con la pipeline y el FallbackClassifier")
+    parser.add_argument("--datos", action="append", required=True,
+                        help="Archivo o carpeta con mensajes etiquetados de prueba en formato nlu.yml (repetible)")
+    parser.add_argument("--transcripciones", action="append", default=[],
+                        help="Archivo o carpeta con trackers JSON exportados de Rasa (repetible)")
+    parser.add_argument("--thresholds", type=_lista_floats, default=_lista_floats(THRESHOLDS))
+    parser.add_argument("--ambiguity-thresholds", type=_lista_floats, default=_lista_floats(AMBIGUITY_THRESHOLDS))
+    parser.add_argument("--variantes", action="store_true",
+                        help="Entrena y evalúa variantes de la pipeline en lugar de un único modelo")
+    parser.add_argument("--datos-entrenamiento", default="data/nlu.yml",
+                        help="Datos NLU con los que se entrenó el modelo (y se entrenan las variantes)")
+    parser.add_argument("--dialogo", action="append",
+                        help="rules.yml/stories.yml de donde leer los intents derivados a Gemini "
+                             "(por defecto data/rules.yml y data/stories.yml)")
+    parser.add_argument("--intents-gemini", type=_lista_strs,
+                        help=f"Intents que terminan en {ACCION_GEMINI}, separados por comas "
+                             "(por defecto se leen de --dialogo)")
+    parser.add_argument("--epocas-diet", type=_lista_ints, default=[],
+                        help="Épocas alternativas del DIETClassifier, p. ej. 50,100,200")
+    parser.add_argument("--salida", help="Ruta del reporte JSON (por defecto reports/nlu/evaluacion_<fecha>.json)")
+    args = parser.parse_args(argv)
+    args.dialogo = args.dialogo or ["data/rules.yml", "data/stories.yml"]
+    return args
+
+
+def _cargar_ejemplos(args):
+    ejemplos = []
+    for ruta in args.datos:
+        ejemplos.extend(YamlNluRepository(ruta).load())
+    for ruta in args.transcripciones:
+        ejemplos.extend(JsonTranscriptsRepository(ruta).load())
+    return ejemplos
+
+
+def _mensajes_de_entrenamiento(ejemplos, args):
+    "Cuenta los mensajes etiquetados que también aparecen en los datos de entrenamiento"
+    textos = {ejemplo.texto.lower() for ejemplo in YamlNluRepository(args.datos_entrenamiento).load()}
+    return sum(1 for ejemplo in ejemplos if ejemplo.esta_etiquetado() and ejemplo.texto.lower() in textos)
+
+
+def _evaluar_modelo(modelo, config, ejemplos, args):
+    interprete = RasaNluInterpreter(modelo)
+    try:
+        use_case = EvaluarNluUseCase(interprete, args.intents_gemini)
+        predicciones = use_case.predecir(ejemplos)
+    finally:
+        interprete.close()
+    reporte = use_case.reporte(
+        predicciones,
+        GenerarVariantesPipelineUseCase.umbrales_fallback(config),
+        args.thresholds,
+        args.ambiguity_thresholds
+    )
+    return {
+        "modelo": modelo,
+        "pipeline": [componente.get("name") for componente in config.get("pipeline") or []],
+        **reporte
+    }
+
+
+def _comparacion(variantes):
+    "Resumen de una línea por variante para comparar reportes rápidamente"
+    return {
+        nombre: {
+            "tasa_gemini": resultado["umbrales_actuales"]["tasa_gemini"],
+            "tasa_fallback": resultado["umbrales_actuales"]["tasa_fallback"],
+            "exactitud": resultado["umbrales_actuales"]["exactitud"],
+            "exactitud_rasa": resultado["umbrales_actuales"]["exactitud_rasa"],
+            "mensajes_por_segundo": resultado["rendimiento"]["mensajes_por_segundo"],
+            "recomendacion": resultado["recomendacion"]
+        }
+        for nombre, resultado in variantes.items()
+        if "error" not in resultado
+    }
+
+
+def main(argv=None):
+    "Ejecuta la evaluación y guarda el reporte JSON"
+    args = parse_args(argv)
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    claves_ignoradas = GenerarVariantesPipelineUseCase.claves_ignoradas_fallback(config)
+    if claves_ignoradas:
+        logger.warning(
+            "FallbackClassifier en %s tiene claves que Rasa ignora: %s; solo threshold y "
+            "ambiguity_threshold tienen efecto",
+            args.config, ", ".join(claves_ignoradas)
+        )
+
+    if args.intents_gemini is None:
+        args.intents_gemini = YamlDialogueRepository(args.dialogo).intents_hacia(ACCION_GEMINI)
+    logger.info("Intents derivados a Gemini además de nlu_fallback: %s", args.intents_gemini)
+
+    ejemplos = _cargar_ejemplos(args)
+    if not ejemplos:
+        logger.error("No se encontraron mensajes para evaluar en %s / %s", args.datos, args.transcripciones)
+        return None
+    etiquetados = sum(1 for ejemplo in ejemplos if ejemplo.esta_etiquetado())
+    logger.info("Mensajes a evaluar: %d (%d etiquetados)", len(ejemplos), etiquetados)
+
+    en_entrenamiento = _mensajes_de_entrenamiento(ejemplos, args)
+    datos_de_entrenamiento = en_entrenamiento > 0 or os.path.abspath(args.datos_entrenamiento) in [
+        os.path.abspath(ruta) for ruta in args.datos
+    ]
+    if datos_de_entrenamiento:
+        logger.warning(
+            "%d de %d mensajes etiquetados están en los datos de entrenamiento (%s): "
+            "la exactitud estará sobreestimada y la recomendación de umbrales sesgada",
+            en_entrenamiento, etiquetados, args.datos_entrenamiento
+        )
+
+    fecha = datetime.now()
+    variantes = {}
+    if args.variantes:
+        out_dir = os.path.join("models", "evaluacion_nlu", fecha.strftime("%Y%m%d_%H%M%S"))
+        trainer = RasaNluTrainer(args.datos_entrenamiento, out_dir)
+        generador = GenerarVariantesPipelineUseCase()
+        for nombre, config_variante in generador.generar(config, args.epocas_diet).items():
+            # Un fallo de entrenamiento no debe descartar las variantes ya evaluadas
+            try:
+                modelo = trainer.entrenar(nombre, config_variante)
+            except subprocess.CalledProcessError as e:
+                logger.exception("Error al entrenar la variante %s: %s", nombre, e)
+                variantes[nombre] = {"error": str(e)}
+                continue
+            variantes[nombre] = _evaluar_modelo(modelo, config_variante, ejemplos, args)
+    else:
+        modelo = args.modelo or _modelo_mas_reciente()
+        if not modelo:
+            logger.error("No se encontró ningún modelo .tar.gz en models/; use --modelo o --variantes")
+            return None
+        variantes["modelo"] = _evaluar_modelo(modelo, config, ejemplos, args)
+
+    reporte = {
+        "generado": fecha.isoformat(timespec="seconds"),
+        "config": args.config,
+        "datos": args.datos,
+        "transcripciones": args.transcripciones,
+        "mensajes": {"total": len(ejemplos), "etiquetados": etiquetados, "en_entrenamiento": en_entrenamiento},
+        "datos_de_entrenamiento": datos_de_entrenamiento,
+        "intents_gemini": args.intents_gemini,
+        "fallback_classifier": {
+            **GenerarVariantesPipelineUseCase.umbrales_fallback(config),
+            "claves_ignoradas": claves_ignoradas
+        },
+        "comparacion": _comparacion(variantes),
+        "variantes": variantes
+    }
+
+    salida = args.salida or os.path.join("reports", "nlu", f"evaluacion_{fecha.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(salida) or ".", exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    for nombre, resumen in reporte["comparacion"].items():
+        logger.info(
+            "%s: gemini=%.1f%% fallback=%.1f%% exactitud=%s msg/s=%.1f",
+            nombre, 100 * resumen["tasa_gemini"], 100 * resumen["tasa_fallback"],
+            resumen["exactitud"], resumen["mensajes_por_segundo"]
+        )
+    logger.info("Reporte guardado en %s", salida)
+    return salida
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Path: src/infrastructure/rasa_nlu/rasa_nlu_interpreter.py
+"""
+
+import asyncio
+
+from src.shared.logger_rasa_v0 import get_logger
+
+logger = get_logger("rasa-nlu-interpreter")
+
+
+class RasaNluInterpreter:
+    """Interpreta mensajes con un modelo Rasa entrenado (.tar.gz) sin levantar el servidor."""
+
+    def __init__(self, model_path):
+        # Import diferido: rasa es pesado y solo hace falta para evaluar el NLU
+        from rasa.core.agent import Agent
+
+        logger.info("Cargando modelo Rasa: %s", model_path)
+        self.model_path = model_path
+        self.agent = Agent.load(model_path)
+        # Un único event loop para todo el lote evita crear uno por mensaje
+        self.loop = asyncio.new_event_loop()
+
+    def parse(self, texto):
+        """Devuelve el parse_data de Rasa (intent, intent_ranking, entities) para el texto."""
+        return self.loop.run_until_complete(self.agent.parse_message(texto))
+
+    def close(self):
+        """Libera el event loop usado para interpretar."""
+        self.loop.close()
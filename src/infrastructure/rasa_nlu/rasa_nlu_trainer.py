@@ -0,0 +1,44 @@
+"""
+Path: src/infrastructure/rasa_nlu/rasa_nlu_trainer.py
+"""
+
+import os
+import subprocess
+import sys
+import yaml
+
+from src.shared.logger_rasa_v0 import get_logger
+
+logger = get_logger("rasa-nlu-trainer")
+
+
+class RasaNluTrainer:
+    """Entrena modelos solo-NLU para variantes de config.yml invocando `rasa train nlu`."""
+
+    def __init__(self, nlu_path, out_dir):
+        self.nlu_path = nlu_path
+        self.out_dir = out_dir
+
+    def entrenar(self, nombre, config):
+        """
+        Escribe la config de la variante y entrena un modelo con nombre fijo.
+        :return: str, ruta al modelo .tar.gz entrenado.
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        config_path = os.path.join(self.out_dir, f"{nombre}.yml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+        logger.info("Entrenando variante %s con %s", nombre, config_path)
+        # Mismo intérprete que el harness, para que Agent.load use la misma versión de Rasa
+        subprocess.run(
+            [
+                sys.executable, "-m", "rasa", "train", "nlu",
+                "--config", config_path,
+                "--nlu", self.nlu_path,
+                "--out", self.out_dir,
+                "--fixed-model-name", nombre
+            ],
+            check=True
+        )
+        return os.path.join(self.out_dir, f"{nombre}.tar.gz")
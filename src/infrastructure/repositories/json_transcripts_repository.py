@@ -0,0 +1,74 @@
+"""
+Path: src/infrastructure/repositories/json_transcripts_repository.py
+"""
+
+import json
+import os
+
+from src.entities.nlu_evaluation import EjemploNlu
+from src.shared.logger_rasa_v0 import get_logger
+
+logger = get_logger("json-transcripts-repository")
+
+
+class JsonTranscriptsRepository:
+    """
+    Repositorio para cargar mensajes de usuario desde transcripciones archivadas.
+    Acepta el tracker exportado por Rasa (`GET /conversations/{id}/tracker`),
+    una lista de trackers o directamente una lista de eventos.
+    """
+
+    def __init__(self, json_path):
+        self.json_path = json_path
+
+    def _archivos(self):
+        if os.path.isdir(self.json_path):
+            return sorted(
+                os.path.join(self.json_path, nombre)
+                for nombre in os.listdir(self.json_path)
+                if nombre.endswith(".json")
+            )
+        return [self.json_path]
+
+    @staticmethod
+    def _eventos(data):
+        if isinstance(data, dict):
+            return data.get("events") or []
+        if isinstance(data, list) and data and isinstance(data[0], dict) and "events" in data[0]:
+            return [
+                evento for tracker in data
+                if isinstance(tracker, dict) and isinstance(tracker.get("events"), list)
+                for evento in tracker["events"]
+            ]
+        return data if isinstance(data, list) else []
+
+    def load(self):
+        """Carga los textos de usuario (sin intent esperado) de cada transcripción."""
+        ejemplos = []
+        for archivo in self._archivos():
+            try:
+                logger.debug("Leyendo transcripción: %s", archivo)
+                with open(archivo, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                logger.error("Transcripción no encontrada: %s", archivo)
+                continue
+            except json.JSONDecodeError as e:
+                logger.error("Error al decodificar JSON: %s", e)
+                continue
+            eventos = self._eventos(data)
+            if not isinstance(eventos, list):
+                logger.error("Formato de transcripción no soportado en %s: events no es una lista", archivo)
+                continue
+            for evento in eventos:
+                if not isinstance(evento, dict):
+                    logger.error("Evento no soportado en %s: %s", archivo, evento)
+                    continue
+                if not isinstance(evento.get("text"), (str, type(None))):
+                    continue
+                texto = (evento.get("text") or "").strip()
+                # Los mensajes "/intent" vienen de botones y no pasan por el NLU
+                if evento.get("event") == "user" and texto and not texto.startswith("/"):
+                    ejemplos.append(EjemploNlu(texto, origen=archivo))
+        logger.debug("Mensajes de transcripciones cargados: %d", len(ejemplos))
+        return ejemplos
@@ -0,0 +1,48 @@
+"""
+Path: src/infrastructure/repositories/yaml_dialogue_repository.py
+"""
+
+import yaml
+
+from src.shared.logger_rasa_v0 import get_logger
+
+logger = get_logger("yaml-dialogue-repository")
+
+
+class YamlDialogueRepository:
+    """Repositorio para leer las reglas e historias de Rasa (rules.yml, stories.yml)."""
+
+    def __init__(self, yaml_paths):
+        self.yaml_paths = yaml_paths
+
+    def intents_hacia(self, action, excluir=("nlu_fallback",)):
+        """
+        Devuelve los intents seguidos directamente por `action` en alguna regla o historia.
+        :param action: str, nombre de la acción (p. ej. action_gemini_fallback).
+        :param excluir: intents a omitir (nlu_fallback se mide con los umbrales).
+        """
+        intents = set()
+        for archivo in self.yaml_paths:
+            try:
+                with open(archivo, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+            except FileNotFoundError:
+                logger.error("Archivo de reglas/historias no encontrado: %s", archivo)
+                continue
+            except yaml.YAMLError as e:
+                logger.error("Error al decodificar YAML: %s", e)
+                continue
+            if not isinstance(data, dict):
+                logger.error("Formato no soportado en %s: se esperaba un mapeo", archivo)
+                continue
+            for flujo in (data.get("rules") or []) + (data.get("stories") or []):
+                pasos = flujo.get("steps") if isinstance(flujo, dict) else None
+                if not isinstance(pasos, list):
+                    continue
+                for paso, siguiente in zip(pasos, pasos[1:]):
+                    if (
+                        isinstance(paso, dict) and isinstance(siguiente, dict)
+                        and paso.get("intent") and siguiente.get("action") == action
+                    ):
+                        intents.add(paso["intent"])
+        return sorted(intents - set(excluir))
@@ -0,0 +1,79 @@
+"""
+Path: src/infrastructure/repositories/yaml_nlu_repository.py
+"""
+
+import os
+import re
+import yaml
+
+from src.entities.nlu_evaluation import EjemploNlu
+from src.shared.logger_rasa_v0 import get_logger
+
+logger = get_logger("yaml-nlu-repository")
+
+# [texto](entidad) o [texto]{"entity": ...}
+ANOTACION_ENTIDAD = re.compile(r"\[([^\]]+)\](\([^)]*\)|\{[^}]*\})")
+
+
+class YamlNluRepository:
+    """Repositorio para cargar mensajes etiquetados en formato NLU de Rasa (nlu.yml)."""
+
+    def __init__(self, yaml_path):
+        self.yaml_path = yaml_path
+
+    def _archivos(self):
+        if os.path.isdir(self.yaml_path):
+            return sorted(
+                os.path.join(self.yaml_path, nombre)
+                for nombre in os.listdir(self.yaml_path)
+                if nombre.endswith((".yml", ".yaml"))
+            )
+        return [self.yaml_path]
+
+    @staticmethod
+    def _ejemplos(bloque):
+        """
+        Devuelve los textos sin anotaciones de entidades. Acepta el bloque `examples: |`
+        y la forma de lista con `- text: ...` (y `metadata` opcional).
+        """
+        if isinstance(bloque, list):
+            textos = [item.get("text") or "" for item in bloque if isinstance(item, dict)]
+        else:
+            textos = [
+                linea.strip()[2:] for linea in (bloque or "").splitlines()
+                if linea.strip().startswith("- ")
+            ]
+        textos = [ANOTACION_ENTIDAD.sub(r"\1", texto).strip() for texto in textos]
+        return [texto for texto in textos if texto]
+
+    def load(self):
+        """Carga los ejemplos etiquetados con su intent esperado."""
+        ejemplos = []
+        for archivo in self._archivos():
+            try:
+                logger.debug("Leyendo archivo NLU: %s", archivo)
+                with open(archivo, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+            except FileNotFoundError:
+                logger.error("Archivo NLU no encontrado: %s", archivo)
+                continue
+            except yaml.YAMLError as e:
+                logger.error("Error al decodificar YAML: %s", e)
+                continue
+            if not isinstance(data, dict):
+                logger.error("Formato NLU no soportado en %s: se esperaba un mapeo con la clave nlu", archivo)
+                continue
+            for entrada in data.get("nlu") or []:
+                if not isinstance(entrada, dict) or not isinstance(entrada.get("intent"), str):
+                    if not isinstance(entrada, dict) or "intent" in entrada:
+                        logger.error("Entrada NLU no soportada en %s: %s", archivo, entrada)
+                    continue
+                # Los intents de recuperación (faq/saludo) se clasifican por su intent base
+                intent = entrada["intent"].split("/", 1)[0]
+                if not isinstance(entrada.get("examples"), (str, list, type(None))):
+                    logger.error("Formato de examples no soportado en %s (intent %s)", archivo, intent)
+                    continue
+                for texto in self._ejemplos(entrada.get("examples")):
+                    ejemplos.append(EjemploNlu(texto, intent_esperado=intent, origen=archivo))
+        logger.debug("Ejemplos etiquetados cargados: %d", len(ejemplos))
+        return ejemplos
@@ -0,0 +1,205 @@
+"""
+Path: src/use_cases/evaluar_nlu.py
+"""
+
+import math
+import time
+from collections import defaultdict
+
+from src.entities.nlu_evaluation import PrediccionNlu
+
+INTENT_FALLBACK = "nlu_fallback"
+
+
+def _percentil(valores: list, percentil: float) -> float:
+    "Percentil por rango más cercano sobre una lista ya ordenada"
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores), math.ceil(percentil / 100 * len(valores))) - 1)
+    return valores[indice]
+
+
+def _resumen(valores: list) -> dict:
+    "Resume una distribución de confianzas (conteo, extremos, media, percentiles e histograma)"
+    ordenados = sorted(valores)
+    histograma = [0] * 10
+    for valor in ordenados:
+        histograma[min(int(valor * 10), 9)] += 1
+    return {
+        "n": len(ordenados),
+        "min": ordenados[0] if ordenados else 0.0,
+        "max": ordenados[-1] if ordenados else 0.0,
+        "media": sum(ordenados) / len(ordenados) if ordenados else 0.0,
+        "p10": _percentil(ordenados, 10),
+        "p50": _percentil(ordenados, 50),
+        "p90": _percentil(ordenados, 90),
+        "histograma": histograma
+    }
+
+
+class EvaluarNluUseCase:
+    "Interpreta mensajes en lote con un modelo NLU y calcula métricas de llamadas a Gemini"
+    def __init__(self, interprete, intents_gemini=None):
+        """
+        :param interprete: Instancia que implemente parse(texto) y devuelva el parse_data de Rasa.
+        :param intents_gemini: set[str] | None, intents que las reglas/historias derivan a
+            action_gemini_fallback además de `nlu_fallback` (p. ej. out_of_scope).
+        """
+        self.interprete = interprete
+        self.intents_gemini = set(intents_gemini or ())
+
+    @staticmethod
+    def ranking_desde_parse(parse_data: dict) -> list:
+        """
+        Extrae el ranking de intents del parse_data, descartando `nlu_fallback`
+        para poder recalcular el fallback con otros umbrales.
+        """
+        ranking = parse_data.get("intent_ranking") or [parse_data.get("intent") or {}]
+        return [
+            (item["name"], float(item.get("confidence") or 0.0))
+            for item in ranking
+            if item.get("name") and item.get("name") != INTENT_FALLBACK
+        ]
+
+    def predecir(self, ejemplos: list) -> list:
+        "Interpreta cada ejemplo y devuelve la lista de PrediccionNlu con su latencia"
+        predicciones = []
+        if ejemplos:
+            # El primer parse inicializa el grafo del modelo; no se cuenta en el rendimiento
+            self.interprete.parse(ejemplos[0].texto)
+        for ejemplo in ejemplos:
+            inicio = time.perf_counter()
+            parse_data = self.interprete.parse(ejemplo.texto)
+            segundos = time.perf_counter() - inicio
+            predicciones.append(PrediccionNlu(ejemplo, self.ranking_desde_parse(parse_data), segundos))
+        return predicciones
+
+    @staticmethod
+    def rendimiento(predicciones: list) -> dict:
+        "Throughput y latencias de inferencia"
+        latencias = sorted(p.segundos for p in predicciones)
+        total = sum(latencias)
+        return {
+            "mensajes": len(latencias),
+            "segundos_totales": total,
+            "mensajes_por_segundo": len(latencias) / total if total else 0.0,
+            "latencia_media_ms": 1000 * total / len(latencias) if latencias else 0.0,
+            "latencia_p95_ms": 1000 * _percentil(latencias, 95)
+        }
+
+    @staticmethod
+    def distribucion_confianza(predicciones: list) -> dict:
+        """
+        Distribución de confianzas por intent predicho y, para los ejemplos
+        etiquetados, la confianza que el modelo asigna al intent esperado.
+        """
+        por_predicho = defaultdict(list)
+        por_esperado = defaultdict(list)
+        for prediccion in predicciones:
+            por_predicho[prediccion.intent].append(prediccion.confianza)
+            if prediccion.ejemplo.esta_etiquetado():
+                confianzas = dict(prediccion.ranking)
+                por_esperado[prediccion.ejemplo.intent_esperado].append(
+                    confianzas.get(prediccion.ejemplo.intent_esperado, 0.0)
+                )
+        return {
+            "por_intent_predicho": {k: _resumen(v) for k, v in sorted(por_predicho.items(), key=lambda i: str(i[0]))},
+            "por_intent_esperado": {k: _resumen(v) for k, v in sorted(por_esperado.items())}
+        }
+
+    def evaluar(self, predicciones: list, threshold: float, ambiguity_threshold: float) -> dict:
+        """
+        Métricas de llamadas a Gemini y exactitud para un par de umbrales del FallbackClassifier.
+        Un mensaje llega a Gemini si cae en `nlu_fallback` o si su intent está en intents_gemini.
+        """
+        fallbacks = 0
+        llamadas_gemini = 0
+        etiquetados = 0
+        aciertos = 0
+        respondidos = 0
+        derivados_esperados = 0
+        aciertos_derivados = 0
+        errores_derivados = 0
+        errores_no_derivados = 0
+        for prediccion in predicciones:
+            es_fallback = prediccion.es_fallback(threshold, ambiguity_threshold)
+            a_gemini = es_fallback or prediccion.intent in self.intents_gemini
+            fallbacks += es_fallback
+            llamadas_gemini += a_gemini
+            if not prediccion.ejemplo.esta_etiquetado():
+                continue
+            etiquetados += 1
+            correcto = prediccion.intent == prediccion.ejemplo.intent_esperado
+            if a_gemini:
+                if prediccion.ejemplo.intent_esperado in self.intents_gemini:
+                    # El mensaje debía terminar en Gemini: la llamada no es evitable
+                    derivados_esperados += 1
+                elif correcto:
+                    aciertos_derivados += 1
+                else:
+                    errores_derivados += 1
+            else:
+                respondidos += 1
+                aciertos += correcto
+                errores_no_derivados += not correcto
+        return {
+            "threshold": threshold,
+            "ambiguity_threshold": ambiguity_threshold,
+            "mensajes": len(predicciones),
+            "fallbacks": fallbacks,
+            "tasa_fallback": fallbacks / len(predicciones) if predicciones else 0.0,
+            "llamadas_gemini": llamadas_gemini,
+            "tasa_gemini": llamadas_gemini / len(predicciones) if predicciones else 0.0,
+            "etiquetados": etiquetados,
+            "exactitud": (aciertos + derivados_esperados) / etiquetados if etiquetados else None,
+            "exactitud_rasa": aciertos / respondidos if respondidos else None,
+            "derivados_esperados_a_gemini": derivados_esperados,
+            "aciertos_derivados_a_gemini": aciertos_derivados,
+            "errores_derivados_a_gemini": errores_derivados,
+            "errores_no_derivados": errores_no_derivados
+        }
+
+    def barrer_umbrales(self, predicciones: list, thresholds: list, ambiguity_thresholds: list) -> list:
+        "Evalúa todas las combinaciones de umbrales reutilizando las mismas predicciones"
+        return [
+            self.evaluar(predicciones, threshold, ambiguity_threshold)
+            for threshold in thresholds
+            for ambiguity_threshold in ambiguity_thresholds
+        ]
+
+    @staticmethod
+    def recomendar(barrido: list, referencia: dict):
+        """
+        Devuelve la combinación con menos llamadas a Gemini cuya exactitud sobre
+        los mensajes que Rasa responde no empeora respecto de la referencia.
+        Sin ejemplos etiquetados no hay forma de medir exactitud y devuelve None.
+        """
+        minimo = referencia.get("exactitud_rasa")
+        if minimo is None:
+            return None
+        candidatos = [
+            resultado for resultado in barrido
+            if resultado["exactitud_rasa"] is not None and resultado["exactitud_rasa"] >= minimo
+        ]
+        if not candidatos:
+            return None
+        return min(candidatos, key=lambda r: (r["tasa_gemini"], -r["exactitud"], -r["threshold"]))
+
+    def reporte(self, predicciones: list, umbrales_actuales: dict, thresholds: list, ambiguity_thresholds: list) -> dict:
+        "Arma el reporte completo de una variante: rendimiento, confianzas, umbrales actuales y barrido"
+        actual = self.evaluar(predicciones, umbrales_actuales["threshold"], umbrales_actuales["ambiguity_threshold"])
+        por_origen = defaultdict(list)
+        for prediccion in predicciones:
+            por_origen[prediccion.ejemplo.origen].append(prediccion)
+        barrido = self.barrer_umbrales(predicciones, thresholds, ambiguity_thresholds)
+        return {
+            "rendimiento": self.rendimiento(predicciones),
+            "confianza": self.distribucion_confianza(predicciones),
+            "umbrales_actuales": actual,
+            "umbrales_actuales_por_origen": {
+                str(origen): self.evaluar(subconjunto, umbrales_actuales["threshold"], umbrales_actuales["ambiguity_threshold"])
+                for origen, subconjunto in sorted(por_origen.items(), key=lambda i: str(i[0]))
+            },
+            "barrido": barrido,
+            "recomendacion": self.recomendar(barrido, actual)
+        }
@@ -0,0 +1,85 @@
+"""
+Path: src/use_cases/variantes_pipeline_nlu.py
+"""
+
+import copy
+
+# Valores por defecto del FallbackClassifier de Rasa 3.6
+THRESHOLD_POR_DEFECTO = 0.3
+AMBIGUITY_THRESHOLD_POR_DEFECTO = 0.1
+CLAVES_FALLBACK_CLASSIFIER = {"name", "threshold", "ambiguity_threshold"}
+
+
+class GenerarVariantesPipelineUseCase:
+    "Genera variantes de la pipeline NLU de config.yml para compararlas offline"
+    @staticmethod
+    def umbrales_fallback(config: dict) -> dict:
+        "Devuelve los umbrales del FallbackClassifier configurados en la pipeline"
+        for componente in config.get("pipeline") or []:
+            if componente.get("name") == "FallbackClassifier":
+                return {
+                    "threshold": componente.get("threshold", THRESHOLD_POR_DEFECTO),
+                    "ambiguity_threshold": componente.get("ambiguity_threshold", AMBIGUITY_THRESHOLD_POR_DEFECTO)
+                }
+        return {"threshold": THRESHOLD_POR_DEFECTO, "ambiguity_threshold": AMBIGUITY_THRESHOLD_POR_DEFECTO}
+
+    @staticmethod
+    def claves_ignoradas_fallback(config: dict) -> list:
+        """
+        Claves del FallbackClassifier que Rasa 3 no reconoce y por lo tanto no tienen efecto
+        (p. ej. `nlu_threshold` o `fallback_action_name`, heredadas de FallbackPolicy).
+        """
+        for componente in config.get("pipeline") or []:
+            if componente.get("name") == "FallbackClassifier":
+                return sorted(set(componente) - CLAVES_FALLBACK_CLASSIFIER)
+        return []
+
+    @staticmethod
+    def response_selector_unico(config: dict) -> dict:
+        "Conserva solo el primer ResponseSelector de la pipeline"
+        variante = copy.deepcopy(config)
+        pipeline = []
+        visto = False
+        for componente in variante.get("pipeline") or []:
+            if componente.get("name") == "ResponseSelector":
+                if visto:
+                    continue
+                visto = True
+            pipeline.append(componente)
+        variante["pipeline"] = pipeline
+        return variante
+
+    @staticmethod
+    def sin_response_selector(config: dict) -> dict:
+        "Quita todos los ResponseSelector (solo aportan con intents de recuperación)"
+        variante = copy.deepcopy(config)
+        variante["pipeline"] = [
+            componente for componente in variante.get("pipeline") or []
+            if componente.get("name") != "ResponseSelector"
+        ]
+        return variante
+
+    @staticmethod
+    def epocas_diet(config: dict, epocas: int) -> dict:
+        "Cambia las épocas de entrenamiento del DIETClassifier"
+        variante = copy.deepcopy(config)
+        for componente in variante.get("pipeline") or []:
+            if componente.get("name") == "DIETClassifier":
+                componente["epochs"] = epocas
+        return variante
+
+    def generar(self, config: dict, epocas: list = None) -> dict:
+        """
+        Devuelve {nombre: config} con la pipeline original y sus variantes.
+        Cada variante cambia un solo aspecto respecto de `base` para que sean comparables.
+        :param config: dict, contenido de config.yml.
+        :param epocas: list[int] | None, épocas alternativas para el DIETClassifier.
+        """
+        variantes = {
+            "base": copy.deepcopy(config),
+            "response_selector_unico": self.response_selector_unico(config),
+            "sin_response_selector": self.sin_response_selector(config)
+        }
+        for valor in epocas or []:
+            variantes[f"diet_epochs_{valor}"] = self.epocas_diet(config, valor)
+        return variantes
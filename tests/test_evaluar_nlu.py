@@ -0,0 +1,170 @@
+"""
+Path: tests/test_evaluar_nlu.py
+"""
+
+import os
+import sys
+
+# Ensure project root is on sys.path so `src.*` imports work during tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.entities.nlu_evaluation import EjemploNlu
+from src.use_cases.evaluar_nlu import EvaluarNluUseCase
+from src.use_cases.variantes_pipeline_nlu import GenerarVariantesPipelineUseCase
+
+
+class FakeInterpreter:
+    "Interprete con respuestas fijas por texto, con el formato de parse_data de Rasa."
+    def __init__(self, rankings):
+        self.rankings = rankings
+
+    def parse(self, texto):
+        "Devuelve un parse_data con nlu_fallback al frente, como lo deja el FallbackClassifier."
+        ranking = [{"name": nombre, "confidence": confianza} for nombre, confianza in self.rankings[texto]]
+        return {
+            "intent": {"name": "nlu_fallback", "confidence": 0.3},
+            "intent_ranking": [{"name": "nlu_fallback", "confidence": 0.3}] + ranking
+        }
+
+
+class CountingInterpreter(FakeInterpreter):
+    "FakeInterpreter que cuenta las llamadas a parse."
+    def __init__(self, rankings):
+        super().__init__(rankings)
+        self.llamadas = 0
+
+    def parse(self, texto):
+        self.llamadas += 1
+        return super().parse(texto)
+
+
+def _predicciones():
+    interprete = FakeInterpreter({
+        "hola": [("saludo", 0.95), ("despedida", 0.05)],
+        "chau": [("despedida", 0.25), ("saludo", 0.20)],
+        "buenas": [("despedida", 0.6), ("saludo", 0.4)],
+        "listo, ya lo instalé": [("afirmar", 0.35), ("saludo", 0.30)]
+    })
+    ejemplos = [
+        EjemploNlu("hola", "saludo", "nlu.yml"),
+        EjemploNlu("chau", "despedida", "nlu.yml"),
+        EjemploNlu("buenas", "saludo", "nlu.yml"),
+        EjemploNlu("listo, ya lo instalé", origen="tracker.json")
+    ]
+    use_case = EvaluarNluUseCase(interprete)
+    return use_case, use_case.predecir(ejemplos)
+
+
+def test_ranking_ignores_nlu_fallback():
+    "The nlu_fallback intent injected by Rasa must not hide the classifier ranking."
+    _, predicciones = _predicciones()
+    assert [p.intent for p in predicciones] == ["saludo", "despedida", "despedida", "afirmar"]
+
+
+def test_evaluar_counts_fallbacks_and_accuracy():
+    "Fallback decisions follow threshold and ambiguity_threshold like FallbackClassifier."
+    use_case, predicciones = _predicciones()
+    resultado = use_case.evaluar(predicciones, threshold=0.3, ambiguity_threshold=0.1)
+    # chau (0.25 < 0.3) y "listo..." (margen 0.05 < 0.1) caen en fallback
+    assert resultado["fallbacks"] == 2
+    assert resultado["tasa_fallback"] == 0.5
+    assert resultado["etiquetados"] == 3
+    assert resultado["aciertos_derivados_a_gemini"] == 1
+    assert resultado["errores_no_derivados"] == 1
+    assert resultado["exactitud_rasa"] == 0.5
+    assert resultado["llamadas_gemini"] == 2
+
+
+def test_recomendar_lowers_fallback_without_losing_accuracy():
+    "The recommendation must keep the precision of the answers Rasa gives itself."
+    use_case, predicciones = _predicciones()
+    actual = use_case.evaluar(predicciones, 0.3, 0.1)
+    barrido = use_case.barrer_umbrales(predicciones, [0.2, 0.3, 0.7], [0.0, 0.1])
+    recomendacion = use_case.recomendar(barrido, actual)
+    assert recomendacion["tasa_gemini"] < actual["tasa_gemini"]
+    assert recomendacion["exactitud_rasa"] >= actual["exactitud_rasa"]
+
+
+def test_confident_out_of_scope_counts_as_gemini_call():
+    "Intents routed to action_gemini_fallback by the rules are paid calls even above the threshold."
+    interprete = FakeInterpreter({
+        "cuánto mide la luna": [("out_of_scope", 0.9), ("saludo", 0.05)],
+        "hola": [("saludo", 0.95), ("despedida", 0.05)]
+    })
+    use_case = EvaluarNluUseCase(interprete, intents_gemini={"out_of_scope", "not_implemented"})
+    predicciones = use_case.predecir([
+        EjemploNlu("cuánto mide la luna", "out_of_scope"),
+        EjemploNlu("hola", "saludo")
+    ])
+    resultado = use_case.evaluar(predicciones, threshold=0.3, ambiguity_threshold=0.1)
+    assert resultado["fallbacks"] == 0
+    assert resultado["llamadas_gemini"] == 1
+    assert resultado["tasa_gemini"] == 0.5
+    assert resultado["derivados_esperados_a_gemini"] == 1
+    assert resultado["errores_no_derivados"] == 0
+    assert resultado["exactitud_rasa"] == 1.0
+    assert resultado["exactitud"] == 1.0
+
+
+def test_recomendar_ignores_savings_that_still_reach_gemini():
+    "Moving a message from nlu_fallback to out_of_scope does not reduce Gemini calls."
+    interprete = FakeInterpreter({"algo raro": [("out_of_scope", 0.25), ("saludo", 0.05)]})
+    use_case = EvaluarNluUseCase(interprete, intents_gemini={"out_of_scope"})
+    predicciones = use_case.predecir([EjemploNlu("algo raro", origen="tracker.json")])
+    actual = use_case.evaluar(predicciones, 0.3, 0.1)
+    bajo = use_case.evaluar(predicciones, 0.2, 0.1)
+    assert actual["tasa_fallback"] == 1.0 and bajo["tasa_fallback"] == 0.0
+    assert actual["tasa_gemini"] == bajo["tasa_gemini"] == 1.0
+
+
+def test_predecir_warms_up_before_timing():
+    "One untimed warm-up parse runs before the timed loop."
+    interprete = CountingInterpreter({"hola": [("saludo", 0.9)]})
+    predicciones = EvaluarNluUseCase(interprete).predecir([EjemploNlu("hola", "saludo")])
+    assert interprete.llamadas == 2
+    assert len(predicciones) == 1
+
+
+def test_reporte_includes_distribution_and_throughput():
+    "The report exposes per-intent confidence and inference throughput."
+    use_case, predicciones = _predicciones()
+    reporte = use_case.reporte(predicciones, {"threshold": 0.3, "ambiguity_threshold": 0.1}, [0.3], [0.1])
+    assert reporte["rendimiento"]["mensajes"] == 4
+    assert reporte["confianza"]["por_intent_predicho"]["despedida"]["n"] == 2
+    assert reporte["confianza"]["por_intent_esperado"]["saludo"]["min"] == 0.4
+    assert set(reporte["umbrales_actuales_por_origen"]) == {"nlu.yml", "tracker.json"}
+
+
+def nombres(config):
+    "Nombres de los componentes de la pipeline, en orden."
+    return [componente["name"] for componente in config["pipeline"]]
+
+
+def test_variantes_pipeline_from_config():
+    "Variants deduplicate ResponseSelector and change DIET epochs without touching the base config."
+    config = {"pipeline": [
+        {"name": "DIETClassifier", "epochs": 100},
+        {"name": "ResponseSelector", "epochs": 100},
+        {"name": "ResponseSelector"},
+        {"name": "FallbackClassifier", "threshold": 0.3}
+    ]}
+    variantes = GenerarVariantesPipelineUseCase().generar(config, [50])
+    assert nombres(variantes["response_selector_unico"]).count("ResponseSelector") == 1
+    assert "ResponseSelector" not in nombres(variantes["sin_response_selector"])
+    assert variantes["diet_epochs_50"]["pipeline"][0]["epochs"] == 50
+    assert nombres(variantes["diet_epochs_50"]) == nombres(config)
+    assert config["pipeline"][0]["epochs"] == 100
+    assert GenerarVariantesPipelineUseCase.umbrales_fallback(config) == {"threshold": 0.3, "ambiguity_threshold": 0.1}
+
+
+def test_claves_ignoradas_fallback():
+    "Keys Rasa 3 does not read from FallbackClassifier, like nlu_threshold, are reported."
+    config = {"pipeline": [
+        {"name": "FallbackClassifier", "threshold": 0.3, "nlu_threshold": 0.2,
+         "fallback_action_name": "action_gemini_fallback"}
+    ]}
+    assert GenerarVariantesPipelineUseCase.claves_ignoradas_fallback(config) == [
+        "fallback_action_name", "nlu_threshold"
+    ]